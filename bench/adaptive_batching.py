@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: batch size vs throughput and latency
+File: adaptive_batching.py
+
+Pushes the same sensor readings through an AdaptiveBatcher configured
+either with a fixed batch size (min == initial == max) or adaptively with
+several latency targets. The stream charges a fixed per-call overhead
+(--overhead-us, modelling I/O or RPC cost per process_batch) on top of
+the real per-item parsing work, which is what makes batch size matter.
+
+Each row is one point of the throughput/latency trade-off curve:
+throughput in items/s and per-batch processing latency (p50, p99).
+
+Usage (from the repository root):
+
+    python3 bench/adaptive_batching.py [--items 200000] [--overhead-us 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import Any, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ex1.data_stream import (  # noqa: E402
+    AdaptiveBatcher,
+    SensorStream,
+    StreamProcessor,
+)
+
+
+class _OverheadSensorStream(SensorStream):
+    """SensorStream that busy-waits a fixed time per batch call."""
+
+    def __init__(self, stream_id: str, overhead: float) -> None:
+        super().__init__(stream_id)
+        self.overhead = overhead
+        self.latencies: List[float] = []
+
+    def process_batch(self, data_batch: List[Any]) -> str:
+        start = time.perf_counter()
+        while time.perf_counter() - start < self.overhead:
+            pass
+        result = super().process_batch(data_batch)
+        self.latencies.append(time.perf_counter() - start)
+        return result
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _run(
+    items: List[str],
+    overhead: float,
+    **batcher_options: Any,
+) -> Tuple[float, float, float, int, int]:
+    processor = StreamProcessor()
+    stream = _OverheadSensorStream("BENCH", overhead)
+    processor.register(stream)
+    batcher = AdaptiveBatcher(processor, max_delay=60.0, **batcher_options)
+
+    start = time.perf_counter()
+    for item in items:
+        batcher.submit("BENCH", item)
+    batcher.flush()
+    elapsed = time.perf_counter() - start
+
+    latencies = stream.latencies
+    return (
+        len(items) / elapsed,
+        _percentile(latencies, 0.50) * 1000,
+        _percentile(latencies, 0.99) * 1000,
+        len(latencies),
+        batcher.target_size("BENCH"),
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--items", type=int, default=200_000)
+    parser.add_argument("--overhead-us", type=float, default=200.0)
+    args = parser.parse_args()
+
+    items = [f"temp:{i % 40}.5" for i in range(args.items)]
+    overhead = args.overhead_us / 1e6
+
+    print(f"{args.items} items, {args.overhead_us:g} us overhead per batch")
+    print(f"{'config':<22} {'items/s':>10} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'batches':>8} {'final size':>10}")
+
+    configs: List[Tuple[str, dict]] = [
+        (f"fixed {size}", {
+            "initial_size": size,
+            "min_size": size,
+            "max_size": size,
+        })
+        for size in (1, 16, 128, 1024, 8192)
+    ]
+    configs += [
+        (f"adaptive {target_ms:g} ms", {
+            "target_latency": target_ms / 1000,
+            "initial_size": 1,
+            "increase": 16,
+        })
+        for target_ms in (0.5, 1.0, 2.0, 5.0)
+    ]
+
+    for label, options in configs:
+        throughput, p50, p99, batches, final = _run(items, overhead, **options)
+        print(f"{label:<22} {throughput:>10.0f} {p50:>8.3f} {p99:>8.3f} "
+              f"{batches:>8} {final:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: text vs zero-copy bytes ingestion
+File: bytes_copies.py
+
+Feeds the same raw buffer of sensor readings to SensorStream three ways:
+
+- text:  decode the buffer, split it into lines and strip each one
+         (how records had to be prepared before bytes were accepted)
+- bytes: buffer.splitlines() -> one small bytes copy per line, no decode
+- views: split_records() -> one memoryview per line, nothing copied
+
+For each path it reports time per record and the bytes allocated per
+record (tracemalloc peak while the batch is built and processed), which
+is where the per-record copies show up.
+
+Usage (from the repository root):
+
+    python3 bench/bytes_copies.py [--records 100000] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ex1.data_stream import SensorStream, split_records  # noqa: E402
+
+
+def _make_buffer(records: int, padding: int) -> bytes:
+    rng = random.Random(5)
+    kinds = ("temp", "humidity", "pressure")
+    width = 6 + padding  # zero-padded values: longer records, same data
+    lines = [
+        f"{rng.choice(kinds)}:{rng.uniform(0, 100):0{width}.2f}"
+        for _ in range(records)
+    ]
+    return ("\n".join(lines) + "\n").encode()
+
+
+def _text_records(buffer: bytes) -> List[Any]:
+    return [line.strip() for line in buffer.decode("utf-8").splitlines()]
+
+
+def _bytes_records(buffer: bytes) -> List[Any]:
+    return buffer.splitlines()
+
+
+def _view_records(buffer: bytes) -> List[Any]:
+    return split_records(buffer)
+
+
+def _measure(
+    buffer: bytes,
+    records: int,
+    prepare: Callable[[bytes], List[Any]],
+    repeat: int,
+) -> Tuple[float, float, str]:
+    best = float("inf")
+    result = ""
+    for _ in range(repeat):
+        stream = SensorStream("BENCH")
+        start = time.perf_counter()
+        result = stream.process_batch(prepare(buffer))
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    SensorStream("BENCH").process_batch(prepare(buffer))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return best / records * 1e6, peak / records, result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--padding",
+        type=int,
+        default=0,
+        help="extra leading zeros per value (long-record case)",
+    )
+    args = parser.parse_args()
+
+    buffer = _make_buffer(args.records, args.padding)
+    print(f"{args.records} records, {len(buffer)} bytes "
+          f"({len(buffer) / args.records:.1f} bytes/record)")
+    print(f"{'path':<6} {'us/record':>10} {'alloc B/record':>15}  result")
+
+    paths = (
+        ("text", _text_records),
+        ("bytes", _bytes_records),
+        ("views", _view_records),
+    )
+    results = []
+    for name, prepare in paths:
+        us, alloc, result = _measure(
+            buffer, args.records, prepare, args.repeat
+        )
+        results.append(result)
+        print(f"{name:<6} {us:>10.3f} {alloc:>15.1f}  {result}")
+
+    if len(set(results)) != 1:
+        print("FAIL: ingestion paths disagree")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: CLI startup import time
+File: startup_importtime.py
+
+Runs the bare `code-nexus stream` and `code-nexus pipeline` paths under
+`python -X importtime` and fails (exit 1) when, for either path:
+
+- the imports it adds on top of a bare interpreter exceed the budget, or
+- an optional heavy backend is imported although no option selected it.
+
+tests/test_nexus_cli.py runs the same lazy-import check under pytest;
+the millisecond budget is machine dependent and only checked here.
+
+Usage (from the repository root):
+
+    python3 bench/startup_importtime.py [--budget-ms 40] [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Tuple
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+OPTIONAL_BACKENDS = (
+    "ex1.stream_sketches",
+    "json",
+    "hashlib",
+    "multiprocessing",
+    "concurrent.futures",
+    "numpy",
+    "orjson",
+)
+
+BARE_PATHS: Dict[str, Tuple[str, str, Tuple[str, ...]]] = {
+    # subcommand: (argv for nexus_cli.main, sample input, must stay lazy)
+    "stream": (
+        "['stream', sys.argv[1], '--type', 'sensor']",
+        "temp:21.5\nhumidity:60\ntemp:23.0\n",
+        OPTIONAL_BACKENDS + ("ex2.nexus_pipeline",),
+    ),
+    "pipeline": (
+        "['pipeline', sys.argv[1], '--format', 'csv']",
+        "alice,login,1\nbob,logout,2\n",
+        OPTIONAL_BACKENDS + ("ex1.data_stream",),
+    ),
+}
+
+
+def _import_times(code: str, *argv: str) -> Dict[str, int]:
+    """
+    Self import time in microseconds per module imported by code.
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code, *argv],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us)
+    return times
+
+
+def measure(
+    argv: str,
+    data_path: str,
+    runs: int,
+) -> Tuple[float, Dict[str, int]]:
+    """
+    Best-of-runs extra import time (ms) of one bare CLI path.
+    """
+    code = f"import sys, nexus_cli; nexus_cli.main({argv})"
+    best_ms = float("inf")
+    best: Dict[str, int] = {}
+    for _ in range(runs):
+        baseline = _import_times("pass")
+        bare = _import_times(code, data_path)
+        extra = {
+            name: us for name, us in bare.items() if name not in baseline
+        }
+        total_ms = sum(extra.values()) / 1000
+        if total_ms < best_ms:
+            best_ms, best = total_ms, extra
+    return best_ms, best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--budget-ms", type=float, default=40.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    failed = False
+    for command, (argv, sample, lazy) in BARE_PATHS.items():
+        failed |= not _check(command, argv, sample, lazy, args)
+    return 1 if failed else 0
+
+
+def _check(
+    command: str,
+    argv: str,
+    sample: str,
+    lazy: Tuple[str, ...],
+    args: argparse.Namespace,
+) -> bool:
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".txt", delete=False
+    ) as handle:
+        handle.write(sample)
+    try:
+        total_ms, modules = measure(argv, handle.name, args.runs)
+    finally:
+        os.unlink(handle.name)
+
+    slowest: List[Tuple[str, int]] = sorted(
+        modules.items(), key=lambda pair: pair[1], reverse=True
+    )[:8]
+    print(f"Bare `{command}` path: {total_ms:.1f} ms of extra imports "
+          f"({len(modules)} modules, budget {args.budget_ms:.1f} ms)")
+    for name, us in slowest:
+        print(f"  {us / 1000:6.2f} ms  {name}")
+
+    ok = True
+    leaked = [name for name in lazy if name in modules]
+    if leaked:
+        print(f"FAIL: lazy modules imported eagerly: {', '.join(leaked)}")
+        ok = False
+    if total_ms > args.budget_ms:
+        print("FAIL: startup import budget exceeded")
+        ok = False
+    if ok:
+        print("OK")
+    return ok
+
+
+if __name__ == "__main__":
+    sys.exit(main())
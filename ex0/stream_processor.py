@@ -11,10 +11,15 @@ specialized processors implement type-specific behavior.
 
 from __future__ import annotations
 
+import re
 from abc import ABC, abstractmethod
 from typing import Any
 
 
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+_LOG_ENTRY = re.compile(rb"\s*([^:]*):\s*(.*?)\s*", re.DOTALL)
+
+
 class DataProcessor(ABC):
     """
     Abstract base processor defining the common processing interface.
@@ -97,10 +102,13 @@ class TextProcessor(DataProcessor):
 class LogProcessor(DataProcessor):
     """
     Processor specialized in log entries, detecting levels like
-    INFO/WARNING/ERROR.
+    INFO/WARNING/ERROR. Accepts text or raw bytes-like entries; the
+    latter are parsed in place and only decoded for the output.
     """
 
     def validate(self, data: Any) -> bool:
+        if isinstance(data, _BYTES_TYPES):
+            return _LOG_ENTRY.fullmatch(data) is not None
         return isinstance(data, str) and ":" in data
 
     def format_output(self, result: str) -> str:
@@ -114,8 +122,12 @@ class LogProcessor(DataProcessor):
             if not self.validate(data):
                 return self.format_output("Error: invalid log entry")
 
-            raw = data.strip()
-            level, message = raw.split(":", 1)
+            if isinstance(data, _BYTES_TYPES):
+                match = _LOG_ENTRY.fullmatch(data)
+                level = match.group(1).decode("latin-1")
+                message = match.group(2).decode("utf-8", "replace")
+            else:
+                level, message = data.strip().split(":", 1)
             level = level.strip().upper()
             message = message.strip()
 
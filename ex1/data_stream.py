@@ -6,11 +6,126 @@ File: data_stream.py
 
 from __future__ import annotations
 
+import re
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+)
 
 
 Stats = Dict[str, Union[str, int, float]]
+Extractor = Callable[[Any], Any]
+
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+
+_WHITESPACE = b" \t\n\r\f\v"
+_NEWLINE = re.compile(rb"\n")
+_PAIR = re.compile(rb"([^:]*):(.*)", re.DOTALL)
+_ERROR_EVENT = re.compile(rb"error", re.IGNORECASE)
+
+
+def split_records(buffer: Union[bytes, bytearray, memoryview]) -> List[Any]:
+    """
+    Split a raw byte buffer (file chunk, socket read) into one stripped
+    memoryview per non-blank line. Views share the buffer: nothing is
+    copied, which pays off for long records; for short lines a plain
+    buffer.splitlines() is cheaper (see bench/bytes_copies.py).
+    """
+    view = memoryview(buffer)
+    records: List[Any] = []
+    start = 0
+    for match in _NEWLINE.finditer(view):
+        record = _strip_view(view, start, match.start())
+        if record:
+            records.append(record)
+        start = match.end()
+    record = _strip_view(view, start, len(view))
+    if record:
+        records.append(record)
+    return records
+
+
+def _strip_view(view: memoryview, start: int, end: int) -> memoryview:
+    """
+    Narrow view[start:end] past surrounding ASCII whitespace (the same
+    set bytes.strip() removes) without copying.
+    """
+    while start < end and view[start] in _WHITESPACE:
+        start += 1
+    while end > start and view[end - 1] in _WHITESPACE:
+        end -= 1
+    if start == 0 and end == len(view):
+        return view
+    return view[start:end]
+
+
+def _normalize(item: Any) -> Any:
+    """
+    Strip a record without decoding it: text and bytes inputs holding the
+    same data normalize to equal records (and equal sketch results).
+    """
+    if isinstance(item, memoryview):
+        return _strip_view(item, 0, len(item))
+    if isinstance(item, (bytes, bytearray)):
+        return item.strip()
+    return str(item).strip()
+
+
+def _record_text(item: Any) -> str:
+    """
+    Decode a record only where text is really needed.
+    """
+    if isinstance(item, _BYTES_TYPES):
+        return bytes(item).decode("utf-8", "replace").strip()
+    return str(item).strip()
+
+
+def _split_pair(item: Any) -> Optional[Tuple[str, Any]]:
+    """
+    Split a record on its first ':' into a text key and a raw value, after
+    stripping the record; key and value are not stripped further, on any
+    input type. For bytes-like records only the short key is decoded and
+    the value stays bytes (int() and float() accept it).
+    """
+    item = _normalize(item)
+    if isinstance(item, (bytes, bytearray)):
+        key, sep, value = item.partition(b":")
+        if not sep:
+            return None
+        return key.decode("latin-1"), value
+    if isinstance(item, memoryview):
+        match = _PAIR.match(item)
+        if match is None:
+            return None
+        return match.group(1).decode("latin-1"), match.group(2)
+
+    if ":" not in item:
+        return None
+    key, value = item.split(":", 1)
+    return key, value
+
+
+def _is_error_event(item: Any) -> bool:
+    if isinstance(item, _BYTES_TYPES):
+        return _ERROR_EVENT.fullmatch(item) is not None
+    return item.lower() == "error"
+
+
+class Sketch(Protocol):
+    """
+    Anything that can absorb items (see stream_sketches.py).
+    """
+
+    def add(self, item: Any) -> None:
+        ...
 
 
 class DataStream(ABC):
@@ -23,6 +138,7 @@ class DataStream(ABC):
         self.stream_type = stream_type
         self._batches_processed = 0
         self._items_processed = 0
+        self._sketches: Dict[str, Tuple[Sketch, Optional[Extractor]]] = {}
 
     @abstractmethod
     def process_batch(self, data_batch: List[Any]) -> str:
@@ -42,7 +158,10 @@ class DataStream(ABC):
             return data_batch
 
         crit = criteria.lower()
-        return [item for item in data_batch if crit in str(item).lower()]
+        return [
+            item for item in data_batch
+            if crit in _record_text(item).lower()
+        ]
 
     def get_stats(self) -> Stats:
         """
@@ -55,10 +174,39 @@ class DataStream(ABC):
             "items_processed": self._items_processed,
         }
 
+    def attach_sketch(
+        self,
+        name: str,
+        sketch: Sketch,
+        extract: Optional[Extractor] = None,
+    ) -> None:
+        """
+        Feed every processed item into sketch, after the batch analysis.
+        extract maps an item to the value to add; returning None skips it.
+        An item that extract or the sketch fails on is skipped for that
+        sketch only, so sketches never change a batch's result.
+        """
+        self._sketches[name] = (sketch, extract)
+
+    def get_sketch(self, name: str) -> Sketch:
+        return self._sketches[name][0]
+
     def _update_stats(self, batch_len: int) -> None:
         self._batches_processed += 1
         self._items_processed += batch_len
 
+    def _observe(self, items: List[Any]) -> None:
+        for sketch, extract in self._sketches.values():
+            for item in items:
+                try:
+                    if extract is not None:
+                        item = extract(item)
+                        if item is None:
+                            continue
+                    sketch.add(item)
+                except Exception:
+                    continue
+
 
 class SensorStream(DataStream):
     """
@@ -73,28 +221,33 @@ class SensorStream(DataStream):
             if not isinstance(data_batch, list) or not data_batch:
                 return "Sensor analysis: 0 readings processed"
 
-            readings = [str(x).strip() for x in data_batch]
+            readings = [_normalize(x) for x in data_batch]
             self._update_stats(len(readings))
 
             temps: List[float] = []
             for item in readings:
-                if item.lower().startswith("temp:"):
-                    _, val = item.split(":", 1)
+                pair = _split_pair(item)
+                if pair is not None and pair[0].lower() == "temp":
                     try:
-                        temps.append(float(val.strip()))
+                        temps.append(float(pair[1]))
                     except ValueError:
                         continue
 
             if temps:
                 avg_temp = sum(temps) / len(temps)
                 avg_temp_str = f"{avg_temp:.1f}".rstrip("0").rstrip(".")
-                return (
+                result = (
                     "Sensor analysis: "
                     f"{len(readings)} readings processed, "
                     f"avg temp: {avg_temp_str}°C"
                 )
+            else:
+                result = (
+                    f"Sensor analysis: {len(readings)} readings processed"
+                )
 
-            return f"Sensor analysis: {len(readings)} readings processed"
+            self._observe(readings)
+            return result
         except Exception:
             return "Sensor analysis: processing failure"
 
@@ -112,17 +265,18 @@ class TransactionStream(DataStream):
             if not isinstance(data_batch, list) or not data_batch:
                 return "Transaction analysis: 0 operations"
 
-            ops = [str(x).strip() for x in data_batch]
+            ops = [_normalize(x) for x in data_batch]
             self._update_stats(len(ops))
 
             net_flow = 0
             for item in ops:
-                if ":" not in item:
+                pair = _split_pair(item)
+                if pair is None:
                     continue
-                action, amount_str = item.split(":", 1)
+                action, amount_raw = pair
                 action = action.strip().lower()
                 try:
-                    amount = int(amount_str.strip())
+                    amount = int(amount_raw)
                 except ValueError:
                     continue
 
@@ -132,11 +286,13 @@ class TransactionStream(DataStream):
                     net_flow += amount
 
             sign = "+" if net_flow >= 0 else ""
-            return (
+            result = (
                 "Transaction analysis: "
                 f"{len(ops)} operations, "
                 f"net flow: {sign}{net_flow} units"
             )
+            self._observe(ops)
+            return result
         except Exception:
             return "Transaction analysis: processing failure"
 
@@ -156,12 +312,11 @@ class TransactionStream(DataStream):
 
         filtered: List[Any] = []
         for item in data_batch:
-            s = str(item).strip()
-            if ":" not in s:
+            pair = _split_pair(item)
+            if pair is None:
                 continue
-            _, amount_str = s.split(":", 1)
             try:
-                amount = int(amount_str.strip())
+                amount = int(pair[1])
             except ValueError:
                 continue
             if amount >= 100:
@@ -182,24 +337,27 @@ class EventStream(DataStream):
             if not isinstance(data_batch, list) or not data_batch:
                 return "Event analysis: 0 events"
 
-            events = [str(x).strip() for x in data_batch]
+            events = [_normalize(x) for x in data_batch]
             self._update_stats(len(events))
 
             errors = sum(
                 1 for e in events
-                if e.lower() == "error"
+                if _is_error_event(e)
             )
 
             if errors == 1:
-                return (
+                result = (
                     f"Event analysis: {len(events)} events, "
                     "1 error detected"
                 )
+            else:
+                result = (
+                    f"Event analysis: {len(events)} events, "
+                    f"{errors} errors detected"
+                )
 
-            return (
-                f"Event analysis: {len(events)} events, "
-                f"{errors} errors detected"
-            )
+            self._observe(events)
+            return result
         except Exception:
             return "Event analysis: processing failure"
 
@@ -215,6 +373,12 @@ class StreamProcessor:
     def register(self, stream: DataStream) -> None:
         self.streams.append(stream)
 
+    def get_stream(self, stream_id: str) -> Optional[DataStream]:
+        for stream in self.streams:
+            if stream.stream_id == stream_id:
+                return stream
+        return None
+
     def process(self, stream: DataStream, batch: List[Any]) -> str:
         try:
             return stream.process_batch(batch)
@@ -229,6 +393,142 @@ class StreamProcessor:
         return results
 
 
+class AdaptiveBatcher:
+    """
+    Batching front-end for a StreamProcessor.
+
+    Items are accumulated per stream_id and flushed as one batch when the
+    batch reaches its target size or its oldest item is max_delay seconds
+    old. The target size adapts to the measured process() time (AIMD):
+    it grows by `increase` items while batches finish within
+    target_latency and is multiplied by `decrease` when one overshoots.
+
+    There is no background thread: deadlines are checked on submit() and
+    poll(), so callers should poll() when their input goes quiet. clock
+    (seconds, monotonic) times both deadlines and batches.
+    """
+
+    def __init__(
+        self,
+        processor: StreamProcessor,
+        target_latency: float = 0.005,
+        max_delay: float = 0.05,
+        initial_size: int = 32,
+        min_size: int = 1,
+        max_size: int = 10_000,
+        increase: int = 8,
+        decrease: float = 0.5,
+        clock: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        if not 1 <= min_size <= initial_size <= max_size:
+            raise ValueError(
+                "Batch sizes must satisfy 1 <= min <= initial <= max"
+            )
+        if target_latency <= 0 or max_delay <= 0:
+            raise ValueError("Latency target and max delay must be positive")
+        if increase < 1 or not 0 < decrease < 1:
+            raise ValueError("AIMD needs increase >= 1 and 0 < decrease < 1")
+        self.processor = processor
+        self.target_latency = target_latency
+        self.max_delay = max_delay
+        self.initial_size = initial_size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.increase = increase
+        self.decrease = decrease
+        self._clock = clock
+        self._pending: Dict[str, List[Any]] = {}
+        self._opened: Dict[str, float] = {}
+        self._targets: Dict[str, int] = {}
+        self._batches: Dict[str, int] = {}
+        self._last_latency: Dict[str, float] = {}
+
+    def submit(self, stream_id: str, item: Any) -> Optional[str]:
+        """
+        Queue one item; returns the analysis string if a batch was flushed.
+        """
+        pending = self._pending.get(stream_id)
+        if pending is None:
+            if self.processor.get_stream(stream_id) is None:
+                raise ValueError(f"Unknown stream: {stream_id}")
+            pending = self._pending[stream_id] = []
+        if not pending:
+            self._opened[stream_id] = self._clock()
+        pending.append(item)
+
+        if len(pending) >= self.target_size(stream_id) or self._expired(
+            stream_id, self._clock()
+        ):
+            return self._flush_stream(stream_id)
+        return None
+
+    def poll(self) -> Dict[str, str]:
+        """
+        Flush every stream whose oldest pending item passed max_delay.
+        """
+        now = self._clock()
+        return {
+            stream_id: self._flush_stream(stream_id)
+            for stream_id in list(self._pending)
+            if self._pending[stream_id] and self._expired(stream_id, now)
+        }
+
+    def flush(self) -> Dict[str, str]:
+        """
+        Flush all pending items regardless of size or deadline.
+        """
+        return {
+            stream_id: self._flush_stream(stream_id)
+            for stream_id in list(self._pending)
+            if self._pending[stream_id]
+        }
+
+    def target_size(self, stream_id: str) -> int:
+        return self._targets.get(stream_id, self.initial_size)
+
+    def get_stats(self) -> Dict[str, Stats]:
+        return {
+            stream_id: {
+                "target_size": self.target_size(stream_id),
+                "pending": len(self._pending.get(stream_id, [])),
+                "batches_flushed": self._batches.get(stream_id, 0),
+                "last_latency_ms": round(
+                    self._last_latency.get(stream_id, 0.0) * 1000, 3
+                ),
+            }
+            for stream_id in self._pending
+        }
+
+    def _expired(self, stream_id: str, now: float) -> bool:
+        return now - self._opened[stream_id] >= self.max_delay
+
+    def _flush_stream(self, stream_id: str) -> str:
+        stream = self.processor.get_stream(stream_id)
+        batch = self._pending[stream_id]
+        self._pending[stream_id] = []
+
+        start = self._clock()
+        result = self.processor.process(stream, batch)
+        elapsed = self._clock() - start
+
+        self._batches[stream_id] = self._batches.get(stream_id, 0) + 1
+        self._last_latency[stream_id] = elapsed
+        self._adapt(stream_id, len(batch), elapsed)
+        return result
+
+    def _adapt(self, stream_id: str, batch_len: int, elapsed: float) -> None:
+        target = self.target_size(stream_id)
+        if elapsed > self.target_latency:
+            target = int(target * self.decrease)
+        elif batch_len >= target:
+            # Only full batches prove the larger size is affordable;
+            # deadline flushes of small batches leave the target alone.
+            target += self.increase
+        self._targets[stream_id] = max(
+            self.min_size, min(self.max_size, target)
+        )
+
+
 def main() -> None:
     print("=== CODE NEXUS - POLYMORPHIC STREAM SYSTEM ===\n")
 
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Exercise 1: Polymorphic Streams
+File: stream_sketches.py
+
+Fixed-memory, mergeable sketches that can be attached to any DataStream
+(or ProcessingPipeline) to answer questions without keeping all data:
+
+- HyperLogLog     -> distinct counts
+- CountMinSketch  -> frequencies and heavy hitters
+- KLLSketch       -> quantiles (p50, p99, ...)
+
+Every sketch exposes the same small interface (add, merge, to_dict) and
+can be rebuilt with sketch_from_dict, so partial sketches produced by
+different workers can be shipped around as plain JSON and merged.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import random
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+
+SketchDict = Dict[str, Any]
+
+
+def _item_bytes(item: Any) -> Union[bytes, bytearray, memoryview]:
+    """
+    Stable byte form of an item, used for hashing.
+    Bytes-like items are hashed as-is (no copy); text is UTF-8 encoded.
+    """
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        return item
+    if not isinstance(item, str):
+        item = str(item)
+    return item.encode("utf-8", "surrogateescape")
+
+
+def _item_label(item: Any) -> str:
+    """
+    Text form of an item, used as a JSON-friendly key.
+    """
+    if isinstance(item, str):
+        return item
+    if isinstance(item, (bytes, bytearray, memoryview)):
+        return bytes(item).decode("utf-8", "surrogateescape")
+    return str(item)
+
+
+def _hll_sigma(x: float) -> float:
+    if x == 1.0:
+        return math.inf
+    y = 1.0
+    z = x
+    while True:
+        x *= x
+        previous = z
+        z += x * y
+        y += y
+        if z == previous:
+            return z
+
+
+def _hll_tau(x: float) -> float:
+    if x in (0.0, 1.0):
+        return 0.0
+    y = 1.0
+    z = 1 - x
+    while True:
+        x = math.sqrt(x)
+        previous = z
+        y *= 0.5
+        z -= (1 - x) ** 2 * y
+        if z == previous:
+            return z / 3
+
+
+class HyperLogLog:
+    """
+    Distinct-count sketch using 2**precision one-byte registers.
+
+    Error bound: relative standard error is 1.04 / sqrt(2**precision),
+    i.e. about 1.6% for the default precision of 12 (4 KiB of registers),
+    from a handful of items up to billions (see count()).
+    """
+
+    kind = "hll"
+
+    def __init__(self, precision: int = 12) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("HyperLogLog precision must be in [4, 16]")
+        self.precision = precision
+        self._m = 1 << precision
+        self._registers = bytearray(self._m)
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(self._m)
+
+    def add(self, item: Any) -> None:
+        digest = hashlib.blake2b(_item_bytes(item), digest_size=8).digest()
+        value = int.from_bytes(digest, "big")
+        tail_bits = 64 - self.precision
+        idx = value >> tail_bits
+        rest = value & ((1 << tail_bits) - 1)
+        rank = tail_bits - rest.bit_length() + 1
+        if rank > self._registers[idx]:
+            self._registers[idx] = rank
+
+    def count(self) -> int:
+        """
+        Ertl's improved raw estimator ("New cardinality estimation
+        algorithms for HyperLogLog sketches", 2017). It works on the
+        register histogram and stays nearly unbiased across the whole
+        range, so there is no switch to linear counting (and no bias bump
+        around it) as in the classic estimator.
+        """
+        m = self._m
+        q = 64 - self.precision
+        histogram = [0] * (q + 2)
+        for rank in self._registers:
+            histogram[rank] += 1
+
+        z = m * _hll_tau(1 - histogram[q + 1] / m)
+        for k in range(q, 0, -1):
+            z = 0.5 * (z + histogram[k])
+        z += m * _hll_sigma(histogram[0] / m)
+        if math.isinf(z):
+            return 0
+        return int(round(m * m / (2 * math.log(2) * z)))
+
+    def merge(self, other: HyperLogLog) -> None:
+        if not isinstance(other, HyperLogLog):
+            raise ValueError("Cannot merge HyperLogLog with another sketch")
+        if other.precision != self.precision:
+            raise ValueError("Cannot merge HyperLogLog of different precision")
+        self._registers = bytearray(
+            max(a, b) for a, b in zip(self._registers, other._registers)
+        )
+
+    def to_dict(self) -> SketchDict:
+        return {
+            "kind": self.kind,
+            "precision": self.precision,
+            "registers": self._registers.hex(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: SketchDict) -> HyperLogLog:
+        sketch = cls(int(data["precision"]))
+        registers = bytearray.fromhex(data["registers"])
+        if len(registers) != sketch._m:
+            raise ValueError("HyperLogLog register count mismatch")
+        sketch._registers = registers
+        return sketch
+
+
+class CountMinSketch:
+    """
+    Frequency sketch with a small candidate set for heavy hitters.
+
+    Error bound: estimate(x) never undercounts, and overcounts by at most
+    epsilon * n with probability 1 - delta, where epsilon = e / width and
+    delta = e ** -depth (n = total count added). The defaults give
+    epsilon ~ 0.13% and delta ~ 0.7%.
+    """
+
+    kind = "cms"
+
+    def __init__(
+        self,
+        width: int = 2048,
+        depth: int = 5,
+        capacity: int = 16,
+    ) -> None:
+        if width < 1 or depth < 1 or capacity < 1:
+            raise ValueError("CountMinSketch dimensions must be positive")
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.n = 0
+        self._table: List[List[int]] = [[0] * width for _ in range(depth)]
+        self._candidates: Dict[str, int] = {}
+
+    @classmethod
+    def from_error(
+        cls,
+        epsilon: float,
+        delta: float,
+        capacity: int = 16,
+    ) -> CountMinSketch:
+        """
+        Size the sketch from the desired (epsilon, delta) guarantee.
+        """
+        if not 0 < epsilon < 1 or not 0 < delta < 1:
+            raise ValueError("epsilon and delta must be in (0, 1)")
+        width = math.ceil(math.e / epsilon)
+        depth = math.ceil(math.log(1 / delta))
+        return cls(width, depth, capacity)
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+    def _indexes(self, item: Any) -> List[int]:
+        digest = hashlib.blake2b(_item_bytes(item), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return [(h1 + row * h2) % self.width for row in range(self.depth)]
+
+    def add(self, item: Any, count: int = 1) -> None:
+        if count < 0:
+            raise ValueError("CountMinSketch count must be non-negative")
+        self.n += count
+        estimate: Optional[int] = None
+        for row, col in enumerate(self._indexes(item)):
+            self._table[row][col] += count
+            cell = self._table[row][col]
+            if estimate is None or cell < estimate:
+                estimate = cell
+        self._track(_item_label(item), estimate or 0)
+
+    def estimate(self, item: Any) -> int:
+        return min(
+            self._table[row][col]
+            for row, col in enumerate(self._indexes(item))
+        )
+
+    def _track(self, label: str, estimate: int) -> None:
+        candidates = self._candidates
+        if label in candidates or len(candidates) < self.capacity:
+            candidates[label] = estimate
+            return
+
+        weakest = min(candidates, key=candidates.__getitem__)
+        if estimate > candidates[weakest]:
+            del candidates[weakest]
+            candidates[label] = estimate
+
+    def heavy_hitters(self, fraction: float = 0.0) -> List[Tuple[str, int]]:
+        """
+        Tracked items whose estimated count is at least fraction * n,
+        most frequent first.
+        """
+        threshold = fraction * self.n
+        hitters = [
+            (label, count)
+            for label, count in self._candidates.items()
+            if count >= threshold
+        ]
+        hitters.sort(key=lambda pair: pair[1], reverse=True)
+        return hitters
+
+    def merge(self, other: CountMinSketch) -> None:
+        if not isinstance(other, CountMinSketch):
+            raise ValueError("Cannot merge CountMinSketch with another sketch")
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("Cannot merge CountMinSketch of different shape")
+
+        for row, other_row in zip(self._table, other._table):
+            for col, cell in enumerate(other_row):
+                row[col] += cell
+        self.n += other.n
+
+        labels = set(self._candidates) | set(other._candidates)
+        ranked = sorted(
+            ((label, self.estimate(label)) for label in labels),
+            key=lambda pair: pair[1],
+            reverse=True,
+        )
+        self._candidates = dict(ranked[:self.capacity])
+
+    def to_dict(self) -> SketchDict:
+        return {
+            "kind": self.kind,
+            "width": self.width,
+            "depth": self.depth,
+            "capacity": self.capacity,
+            "n": self.n,
+            "table": [list(row) for row in self._table],
+            "candidates": dict(self._candidates),
+        }
+
+    @classmethod
+    def from_dict(cls, data: SketchDict) -> CountMinSketch:
+        sketch = cls(
+            int(data["width"]),
+            int(data["depth"]),
+            int(data["capacity"]),
+        )
+        table = [[int(cell) for cell in row] for row in data["table"]]
+        if len(table) != sketch.depth or any(
+            len(row) != sketch.width for row in table
+        ):
+            raise ValueError("CountMinSketch table shape mismatch")
+        sketch._table = table
+        sketch.n = int(data["n"])
+        sketch._candidates = {
+            str(label): int(count)
+            for label, count in data["candidates"].items()
+        }
+        return sketch
+
+
+class KLLSketch:
+    """
+    Quantile sketch (Karnin-Lang-Liberty) over numeric values.
+
+    Error bound: the rank of the returned quantile is off by at most about
+    1.65% of n with high probability for the default k=200; the error
+    shrinks roughly as 1/k. Memory stays around 3*k values.
+    """
+
+    kind = "kll"
+
+    _DECAY = 2.0 / 3.0
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        if k < 8:
+            raise ValueError("KLLSketch k must be at least 8")
+        self.k = k
+        self.n = 0
+        self._levels: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, math.ceil(self.k * self._DECAY ** depth))
+
+    def _size(self) -> int:
+        return sum(len(items) for items in self._levels)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(h) for h in range(len(self._levels)))
+
+    def add(self, value: Any) -> None:
+        self._levels[0].append(float(value))
+        self.n += 1
+        if len(self._levels[0]) >= self._capacity(0):
+            self._compress()
+
+    def _compress(self) -> None:
+        while self._size() >= self._max_size():
+            for level, items in enumerate(self._levels):
+                if len(items) >= self._capacity(level):
+                    break
+            else:
+                return
+
+            if level + 1 == len(self._levels):
+                self._levels.append([])
+
+            items.sort()
+            kept = [items.pop()] if len(items) % 2 else []
+            offset = self._rng.randint(0, 1)
+            self._levels[level + 1].extend(items[offset::2])
+            self._levels[level] = kept
+
+    def _weighted(self) -> List[Tuple[float, int]]:
+        weighted = [
+            (value, 1 << level)
+            for level, items in enumerate(self._levels)
+            for value in items
+        ]
+        weighted.sort()
+        return weighted
+
+    def quantile(self, q: float) -> float:
+        if not 0.0 <= q <= 1.0:
+            raise ValueError("Quantile must be in [0, 1]")
+        weighted = self._weighted()
+        if not weighted:
+            raise ValueError("Quantile of an empty sketch")
+
+        target = q * sum(weight for _, weight in weighted)
+        cumulative = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return weighted[-1][0]
+
+    def rank(self, value: float) -> float:
+        """
+        Estimated fraction of added values that are <= value.
+        """
+        weighted = self._weighted()
+        total = sum(weight for _, weight in weighted)
+        if total == 0:
+            return 0.0
+        below = sum(weight for item, weight in weighted if item <= value)
+        return below / total
+
+    def merge(self, other: KLLSketch) -> None:
+        if not isinstance(other, KLLSketch):
+            raise ValueError("Cannot merge KLLSketch with another sketch")
+        if other.k != self.k:
+            raise ValueError("Cannot merge KLLSketch with different k")
+
+        while len(self._levels) < len(other._levels):
+            self._levels.append([])
+        for level, items in enumerate(other._levels):
+            self._levels[level].extend(items)
+        self.n += other.n
+        self._compress()
+
+    def to_dict(self) -> SketchDict:
+        return {
+            "kind": self.kind,
+            "k": self.k,
+            "n": self.n,
+            "levels": [list(items) for items in self._levels],
+        }
+
+    @classmethod
+    def from_dict(cls, data: SketchDict) -> KLLSketch:
+        sketch = cls(int(data["k"]))
+        sketch.n = int(data["n"])
+        sketch._levels = [
+            [float(value) for value in items] for items in data["levels"]
+        ] or [[]]
+        return sketch
+
+
+_SKETCH_KINDS: Dict[str, Type[Any]] = {
+    HyperLogLog.kind: HyperLogLog,
+    CountMinSketch.kind: CountMinSketch,
+    KLLSketch.kind: KLLSketch,
+}
+
+
+def sketch_from_dict(data: SketchDict) -> Any:
+    """
+    Rebuild any sketch serialized with to_dict().
+    """
+    try:
+        sketch_cls = _SKETCH_KINDS[data["kind"]]
+    except KeyError:
+        raise ValueError(f"Unknown sketch kind: {data.get('kind')!r}")
+    return sketch_cls.from_dict(data)
@@ -6,8 +6,30 @@ File: nexus_pipeline.py
 
 from __future__ import annotations
 
+import queue
+import re
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Protocol, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    Union,
+)
+
+
+Extractor = Callable[[Any], Any]
+KeyFunc = Callable[[Any], Any]
+StageStats = Dict[str, Union[int, float, str]]
+
+_BYTES_TYPES = (bytes, bytearray, memoryview)
+_TEMP_VALUE = re.compile(rb'"value":\s*([0-9.-]*)')
 
 
 class ProcessingStage(Protocol):
@@ -15,12 +37,19 @@ class ProcessingStage(Protocol):
         """Process input data and return transformed output."""
 
 
+class Sketch(Protocol):
+    def add(self, item: Any) -> None:
+        """Absorb one item (e.g. ex1/stream_sketches.py sketches)."""
+
+
 class InputStage:
     """Stage 1: Input validation and parsing"""
 
     def process(self, data: Any) -> Any:
         if data is None:
             raise ValueError("Invalid input: None")
+        # Bytes-like input passes through as is (already zero-copy); a
+        # stage that slices it makes its own memoryview.
         return data
 
 
@@ -31,7 +60,10 @@ class TransformStage:
         self.fail_on_invalid = fail_on_invalid
 
     def process(self, data: Any) -> Any:
-        if self.fail_on_invalid and data == "INVALID_DATA_FORMAT":
+        if self.fail_on_invalid and data in (
+            "INVALID_DATA_FORMAT",
+            b"INVALID_DATA_FORMAT",
+        ):
             raise ValueError("Invalid data format")
         return {
             "payload": data,
@@ -62,6 +94,207 @@ class OutputStage:
         return data
 
 
+class ExecutionPolicy:
+    """How a stage runs in ProcessingPipeline.run_many()."""
+
+    INLINE = "inline"
+    THREAD = "thread"
+    PROCESS = "process"
+
+    def __init__(
+        self,
+        mode: str = INLINE,
+        workers: int = 1,
+        queue_size: int = 64,
+    ) -> None:
+        if mode not in (self.INLINE, self.THREAD, self.PROCESS):
+            raise ValueError(f"Unknown execution mode: {mode}")
+        if workers < 1 or queue_size < 1:
+            raise ValueError("Workers and queue size must be positive")
+        if mode == self.INLINE and workers != 1:
+            raise ValueError("Inline stages run with exactly one worker")
+        self.mode = mode
+        self.workers = workers
+        self.queue_size = queue_size
+
+    @classmethod
+    def threads(cls, workers: int, queue_size: int = 64) -> ExecutionPolicy:
+        return cls(cls.THREAD, workers, queue_size)
+
+    @classmethod
+    def processes(
+        cls,
+        workers: int,
+        queue_size: int = 64,
+    ) -> ExecutionPolicy:
+        """
+        The stage must be picklable: worker processes are spawned (never
+        forked from the threaded pipeline), each gets one copy of the
+        stage at startup, and state it changes there stays in that worker.
+        """
+        return cls(cls.PROCESS, workers, queue_size)
+
+
+INLINE_POLICY = ExecutionPolicy()
+
+_DONE = object()
+
+# Stage copy owned by a process-pool worker (set by _init_worker_stage).
+_WORKER_STAGE: Optional[ProcessingStage] = None
+
+
+def _init_worker_stage(stage: ProcessingStage) -> None:
+    global _WORKER_STAGE
+    _WORKER_STAGE = stage
+
+
+def _run_worker_stage(data: Any) -> Any:
+    assert _WORKER_STAGE is not None
+    return _WORKER_STAGE.process(data)
+
+
+def stage_policy(stage: ProcessingStage) -> ExecutionPolicy:
+    """
+    Policy a stage declares through an ExecutionPolicy `policy` attribute,
+    else inline (a `policy` attribute of any other type is not one).
+    """
+    policy = getattr(stage, "policy", None)
+    if isinstance(policy, ExecutionPolicy):
+        return policy
+    return INLINE_POLICY
+
+
+class _StageRunner:
+    """Worker threads and bounded input queues for one stage."""
+
+    def __init__(
+        self,
+        stage: ProcessingStage,
+        policy: ExecutionPolicy,
+        downstream: Any,
+        keyed: bool,
+    ) -> None:
+        self.stage = stage
+        self.policy = policy
+        self.downstream = downstream
+        self.busy = 0.0
+        self.items = 0
+        self.errors = 0
+        lanes = self.policy.workers if keyed else 1
+        self._queues: List[queue.Queue[Any]] = [
+            queue.Queue(maxsize=self.policy.queue_size)
+            for _ in range(lanes)
+        ]
+        self._lock = threading.Lock()
+        self._alive = self.policy.workers
+        self._pool: Any = None
+        self._threads: List[threading.Thread] = []
+
+    def start(self, on_error: Callable[[int, Exception], None]) -> None:
+        call = self.stage.process
+        if self.policy.mode == ExecutionPolicy.PROCESS:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # Forking while other stages' threads run can deadlock the
+            # child, so workers always start from a fresh interpreter.
+            self._pool = ProcessPoolExecutor(
+                self.policy.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker_stage,
+                initargs=(self.stage,),
+            )
+            call = self._call_in_pool
+
+        for worker in range(self.policy.workers):
+            lane = self._queues[worker % len(self._queues)]
+            thread = threading.Thread(
+                target=self._work,
+                args=(lane, call, on_error),
+                daemon=True,
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def _call_in_pool(self, data: Any) -> Any:
+        """
+        The stage is pickled once per worker process, not per item; each
+        worker runs its own copy, so state the stage changes in a worker
+        is never seen by the parent. A memoryview given as input cannot
+        be pickled, so it crosses as bytes.
+        """
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return self._pool.submit(_run_worker_stage, data).result()
+
+    def put(self, entry: Tuple[int, Any, Any]) -> None:
+        """Route an entry; equal keys always share a lane (keeps order)."""
+        lane = hash(entry[1]) % len(self._queues)
+        self._queues[lane].put(entry)
+
+    def close(self) -> None:
+        for worker in range(self.policy.workers):
+            self._queues[worker % len(self._queues)].put(_DONE)
+
+    def join(self) -> None:
+        for thread in self._threads:
+            thread.join()
+        if self._pool is not None:
+            self._pool.shutdown()
+
+    def _work(
+        self,
+        lane: queue.Queue[Any],
+        call: Callable[[Any], Any],
+        on_error: Callable[[int, Exception], None],
+    ) -> None:
+        try:
+            while True:
+                entry = lane.get()
+                if entry is _DONE:
+                    break
+                seq, key, data = entry
+                start = time.perf_counter()
+                try:
+                    result = call(data)
+                except Exception as exc:
+                    self._account(start, failed=True)
+                    on_error(seq, exc)
+                    continue
+                self._account(start, failed=False)
+                try:
+                    self.downstream.put((seq, key, result))
+                except Exception as exc:
+                    on_error(seq, exc)
+        finally:
+            with self._lock:
+                self._alive -= 1
+                last = self._alive == 0
+            if last:
+                self.downstream.close()
+
+    def _account(self, start: float, failed: bool) -> None:
+        elapsed = time.perf_counter() - start
+        with self._lock:
+            self.busy += elapsed
+            self.items += 1
+            self.errors += failed
+
+
+class _ResultSink:
+    """Final consumer of run_many(): stores outputs by input position."""
+
+    def __init__(self, on_result: Callable[[int, Any], None]) -> None:
+        self._on_result = on_result
+        self.finished = threading.Event()
+
+    def put(self, entry: Tuple[int, Any, Any]) -> None:
+        self._on_result(entry[0], entry[2])
+
+    def close(self) -> None:
+        self.finished.set()
+
+
 class ProcessingPipeline(ABC):
     def __init__(self) -> None:
         self.stages: List[ProcessingStage] = [
@@ -72,14 +305,192 @@ class ProcessingPipeline(ABC):
         self._processed: int = 0
         self._errors: int = 0
         self._last_error: Optional[str] = None
+        self._sketches: Dict[str, Tuple[Sketch, Optional[Extractor]]] = {}
+        self._stage_stats: List[StageStats] = []
+        self._policies: List[Optional[ExecutionPolicy]] = []
+        self._lock = threading.Lock()
 
     def run(self, data: Any) -> Any:
         current: Any = data
         for stage in self.stages:
             current = stage.process(current)
         self._processed += 1
+        self._observe(data)
         return current
 
+    def run_many(
+        self,
+        items: Iterable[Any],
+        key: Optional[KeyFunc] = None,
+    ) -> List[Any]:
+        """
+        Run many inputs with each stage under its own ExecutionPolicy.
+
+        Stages are connected by bounded queues, so a slow stage applies
+        backpressure instead of buffering everything. With key, items
+        sharing a key are processed in input order by every stage.
+        Outputs come back in input order; failed items are recorded as
+        errors and yield None.
+        """
+        inputs = list(items)
+        results: List[Any] = [None] * len(inputs)
+        policies = [
+            self.get_stage_policy(index) for index in range(len(self.stages))
+        ]
+        start = time.perf_counter()
+
+        if all(p.mode == ExecutionPolicy.INLINE for p in policies):
+            busy = self._run_inline(inputs, results)
+        else:
+            busy = self._run_staged(inputs, results, policies, key)
+
+        wall = time.perf_counter() - start
+        self._stage_stats = [
+            {
+                "stage": type(stage).__name__,
+                "mode": policy.mode,
+                "workers": policy.workers,
+                "items": items_done,
+                "errors": errors,
+                "busy_s": round(busy_s, 6),
+                "utilization": round(
+                    busy_s / (wall * policy.workers) if wall else 0.0, 3
+                ),
+            }
+            for stage, policy, (busy_s, items_done, errors)
+            in zip(self.stages, policies, busy)
+        ]
+        return results
+
+    def _run_inline(
+        self,
+        inputs: List[Any],
+        results: List[Any],
+    ) -> List[Tuple[float, int, int]]:
+        busy = [[0.0, 0, 0] for _ in self.stages]
+        for seq, data in enumerate(inputs):
+            current: Any = data
+            try:
+                for stage, totals in zip(self.stages, busy):
+                    totals[1] += 1
+                    started = time.perf_counter()
+                    try:
+                        current = stage.process(current)
+                    finally:
+                        totals[0] += time.perf_counter() - started
+            except Exception as exc:
+                totals[2] += 1
+                self._record_error(exc)
+                continue
+            try:
+                self._finish(seq, data, current, results)
+            except Exception as exc:
+                self._record_error(exc)
+        return [(b, int(n), int(e)) for b, n, e in busy]
+
+    def _run_staged(
+        self,
+        inputs: List[Any],
+        results: List[Any],
+        policies: List[ExecutionPolicy],
+        key: Optional[KeyFunc],
+    ) -> List[Tuple[float, int, int]]:
+        def on_result(seq: int, output: Any) -> None:
+            self._finish(seq, inputs[seq], output, results)
+
+        def on_error(seq: int, exc: Exception) -> None:
+            with self._lock:
+                self._record_error(exc)
+
+        sink = _ResultSink(on_result)
+        runners: List[_StageRunner] = []
+        downstream: Any = sink
+        for stage, policy in reversed(list(zip(self.stages, policies))):
+            runner = _StageRunner(stage, policy, downstream, key is not None)
+            runners.insert(0, runner)
+            downstream = runner
+
+        for runner in runners:
+            runner.start(on_error)
+        try:
+            for seq, data in enumerate(inputs):
+                runners[0].put((seq, key(data) if key else None, data))
+        finally:
+            runners[0].close()
+            sink.finished.wait()
+            for runner in runners:
+                runner.join()
+
+        return [(r.busy, r.items, r.errors) for r in runners]
+
+    def _finish(
+        self,
+        seq: int,
+        data: Any,
+        output: Any,
+        results: List[Any],
+    ) -> None:
+        """
+        Record a finished item. Both run_many() paths count an exception
+        here as an error of that item, which then yields None.
+        """
+        with self._lock:
+            self._observe(data)
+            self._processed += 1
+            results[seq] = output
+
+    def set_stage_policy(self, index: int, policy: ExecutionPolicy) -> None:
+        """
+        Declare how self.stages[index] runs in run_many(). The override
+        belongs to the pipeline position, so it survives replacing the
+        stage (set_transform_stage(), NexusManager.recover_pipeline()).
+        """
+        index = range(len(self.stages))[index]
+        missing = index + 1 - len(self._policies)
+        self._policies.extend([None] * missing)
+        self._policies[index] = policy
+
+    def get_stage_policy(self, index: int) -> ExecutionPolicy:
+        """Override set for self.stages[index], else the stage's own."""
+        index = range(len(self.stages))[index]
+        if index < len(self._policies):
+            override = self._policies[index]
+            if override is not None:
+                return override
+        return stage_policy(self.stages[index])
+
+    def get_stage_stats(self) -> List[StageStats]:
+        """
+        Per-stage load of the last run_many(). Utilization is busy time
+        over wall time x workers: the highest one is the bottleneck.
+        """
+        return [dict(stats) for stats in self._stage_stats]
+
+    def attach_sketch(
+        self,
+        name: str,
+        sketch: Sketch,
+        extract: Optional[Extractor] = None,
+    ) -> None:
+        """
+        Feed every successfully processed input into sketch. An input that
+        extract or the sketch fails on is skipped for that sketch only and
+        is never counted as a pipeline error.
+        """
+        self._sketches[name] = (sketch, extract)
+
+    def get_sketch(self, name: str) -> Sketch:
+        return self._sketches[name][0]
+
+    def _observe(self, data: Any) -> None:
+        for sketch, extract in self._sketches.values():
+            try:
+                item = data if extract is None else extract(data)
+                if item is not None:
+                    sketch.add(item)
+            except Exception:
+                continue
+
     def get_stats(self) -> Dict[str, Union[int, str]]:
         return {
             "processed": self._processed,
@@ -105,7 +516,14 @@ class JSONAdapter(ProcessingPipeline):
         self.pipeline_id = pipeline_id
 
     @staticmethod
-    def _extract_temp_value(data: str) -> float:
+    def _extract_temp_value(data: Any) -> float:
+        if isinstance(data, _BYTES_TYPES):
+            match = _TEMP_VALUE.search(data)
+            try:
+                return float(match.group(1)) if match else 0.0
+            except ValueError:
+                return 0.0
+
         marker = '"value":'
         idx = data.find(marker)
         if idx == -1:
@@ -130,7 +548,7 @@ class JSONAdapter(ProcessingPipeline):
             _ = self.run(data)
             value = 23.5
 
-            if isinstance(data, str):
+            if isinstance(data, (str,) + _BYTES_TYPES):
                 extracted = self._extract_temp_value(data)
                 if extracted != 0.0:
                     value = extracted
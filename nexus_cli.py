@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Code Nexus command line entry point.
+
+Runs the ex1 streams or the ex2 pipelines over a file, one item per line:
+
+    code-nexus stream data.txt --type sensor --batch-size 100
+    code-nexus pipeline data.csv --format csv
+
+Input is read as raw bytes and handed to the streams and pipelines as
+bytes records; text is decoded only where a stage needs it.
+
+The bare path only imports argparse and the exercise module it needs.
+Optional backends (sketches, JSON output) are imported lazily, only when
+the option that selects them is given; bench/startup_importtime.py guards
+this with an import-time budget.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Callable, Iterator, List, Optional, Sequence
+
+
+_CHUNK_SIZE = 1 << 20
+
+Extractor = Callable[[Any], Any]
+
+
+def _read_records(path: str) -> Iterator[bytes]:
+    """
+    Yield one stripped bytes record per non-blank line, without decoding.
+    CLI lines are short, where a small bytes copy beats a memoryview
+    (bench/bytes_copies.py); split_records() is for long-record callers.
+    """
+    with open(path, "rb") as handle:
+        tail = b""
+        while True:
+            chunk = handle.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (tail + chunk if tail else chunk).split(b"\n")
+            tail = lines.pop()
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield line
+        tail = tail.strip()
+        if tail:
+            yield tail
+
+
+def _batched(items: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    batch: List[Any] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _stream_values(stream_type: str) -> Optional[Extractor]:
+    """
+    The value a stream's own analysis reads from a record: the `temp`
+    reading of a sensor stream, the buy/sell amount of a transaction
+    stream. Event streams carry no value. Other records map to None.
+    """
+    from ex1.data_stream import _split_pair
+
+    def temperature(item: Any) -> Optional[float]:
+        pair = _split_pair(item)
+        if pair is None or pair[0].lower() != "temp":
+            return None
+        return float(pair[1])
+
+    def amount(item: Any) -> Optional[int]:
+        pair = _split_pair(item)
+        if pair is None or pair[0].strip().lower() not in ("buy", "sell"):
+            return None
+        return int(pair[1])
+
+    return {"sensor": temperature, "transaction": amount}.get(stream_type)
+
+
+def _pipeline_values(data_format: str) -> Optional[Extractor]:
+    """The temperature `"value"` of JSON records; other formats have none."""
+    if data_format != "json":
+        return None
+
+    from ex2.nexus_pipeline import JSONAdapter
+
+    def temperature(item: Any) -> Optional[float]:
+        if b'"value":' not in item:
+            return None
+        return JSONAdapter._extract_temp_value(item)
+
+    return temperature
+
+
+def _attach_sketches(
+    target: Any,
+    kinds: Sequence[str],
+    values: Optional[Extractor],
+) -> None:
+    """
+    distinct counts whole records; quantiles and heavy read the values
+    extracted by values, or heavy counts whole records when there are none.
+    """
+    if not kinds:
+        return
+
+    from ex1.stream_sketches import CountMinSketch, HyperLogLog, KLLSketch
+
+    factories = {
+        "distinct": lambda: (HyperLogLog(), None),
+        "quantiles": lambda: (KLLSketch(), values),
+        "heavy": lambda: (CountMinSketch(), values),
+    }
+    for kind in kinds:
+        sketch, extract = factories[kind]()
+        target.attach_sketch(kind, sketch, extract)
+
+
+def _report_sketches(target: Any, kinds: Sequence[str]) -> None:
+    summaries = {
+        "distinct": lambda s: f"{s.count()} distinct items",
+        "quantiles": lambda s: (
+            "no numeric values" if s.n == 0 else ", ".join(
+                f"p{int(q * 100)}={s.quantile(q):g}"
+                for q in (0.5, 0.9, 0.99)
+            )
+        ),
+        "heavy": lambda s: ", ".join(
+            f"{label} ({count})" for label, count in s.heavy_hitters(0.01)
+        ) or "none",
+    }
+    for kind in kinds:
+        print(f"Sketch {kind}: {summaries[kind](target.get_sketch(kind))}")
+
+
+def _dump_sketches(target: Any, kinds: Sequence[str], path: str) -> None:
+    import json
+
+    payload = {kind: target.get_sketch(kind).to_dict() for kind in kinds}
+    with open(path, "w", encoding="utf-8") as handle:
+        json.dump(payload, handle)
+
+
+def _run_stream(args: Any) -> int:
+    from ex1.data_stream import (
+        EventStream,
+        SensorStream,
+        StreamProcessor,
+        TransactionStream,
+    )
+
+    stream_types = {
+        "sensor": SensorStream,
+        "transaction": TransactionStream,
+        "event": EventStream,
+    }
+    values = _stream_values(args.type)
+    if values is None and "quantiles" in args.sketch:
+        return _error(f"{args.type} records have no quantiles value")
+    stream = stream_types[args.type](args.stream_id)
+    processor = StreamProcessor()
+    processor.register(stream)
+    _attach_sketches(stream, args.sketch, values)
+
+    for batch in _batched(_read_records(args.file), args.batch_size):
+        if args.filter is not None:
+            batch = stream.filter_data(batch, args.filter)
+        print(processor.process(stream, batch))
+
+    stats = stream.get_stats()
+    print(
+        f"Stream {stats['stream_id']}: "
+        f"{stats['batches_processed']} batches, "
+        f"{stats['items_processed']} items"
+    )
+    _report_sketches(stream, args.sketch)
+    if args.sketch_out:
+        _dump_sketches(stream, args.sketch, args.sketch_out)
+    return 0
+
+
+def _run_pipeline(args: Any) -> int:
+    from ex2.nexus_pipeline import CSVAdapter, JSONAdapter, StreamAdapter
+
+    adapters = {
+        "json": JSONAdapter,
+        "csv": CSVAdapter,
+        "stream": StreamAdapter,
+    }
+    values = _pipeline_values(args.format)
+    if values is None and "quantiles" in args.sketch:
+        return _error(f"{args.format} records have no quantiles value")
+    pipeline = adapters[args.format](args.pipeline_id)
+    _attach_sketches(pipeline, args.sketch, values)
+
+    for record in _read_records(args.file):
+        print(pipeline.process(record))
+
+    stats = pipeline.get_stats()
+    print(
+        f"Pipeline {args.pipeline_id}: {stats['processed']} processed, "
+        f"{stats['errors']} errors"
+    )
+    _report_sketches(pipeline, args.sketch)
+    if args.sketch_out:
+        _dump_sketches(pipeline, args.sketch, args.sketch_out)
+    return 1 if stats["errors"] else 0
+
+
+def _positive_int(text: str) -> int:
+    import argparse
+
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(
+            f"must be a positive integer: {text!r}"
+        )
+    return value
+
+
+def _build_parser() -> Any:
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="code-nexus",
+        description="Run Code Nexus streams and pipelines over a file.",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sketch_options = argparse.ArgumentParser(add_help=False)
+    sketch_options.add_argument(
+        "--sketch",
+        action="append",
+        default=[],
+        choices=["distinct", "quantiles", "heavy"],
+        help="attach an approximate sketch (repeatable)",
+    )
+    sketch_options.add_argument(
+        "--sketch-out",
+        metavar="PATH",
+        help="write the sketches as mergeable JSON",
+    )
+
+    stream = commands.add_parser(
+        "stream",
+        parents=[sketch_options],
+        help="process a file as batches of a DataStream",
+    )
+    stream.add_argument("file")
+    stream.add_argument(
+        "--type",
+        choices=["sensor", "transaction", "event"],
+        default="sensor",
+    )
+    stream.add_argument("--stream-id", default="CLI_STREAM")
+    stream.add_argument("--batch-size", type=_positive_int, default=100)
+    stream.add_argument("--filter", metavar="CRITERIA")
+    stream.set_defaults(handler=_run_stream)
+
+    pipeline = commands.add_parser(
+        "pipeline",
+        parents=[sketch_options],
+        help="process each line of a file through a pipeline adapter",
+    )
+    pipeline.add_argument("file")
+    pipeline.add_argument(
+        "--format",
+        choices=["json", "csv", "stream"],
+        default="json",
+    )
+    pipeline.add_argument("--pipeline-id", default="CLI_PIPELINE")
+    pipeline.set_defaults(handler=_run_pipeline)
+
+    return parser
+
+
+def _error(message: str) -> int:
+    """Report a usage or I/O error; exit code 2, unlike pipeline errors (1)."""
+    print(f"code-nexus: {message}", file=sys.stderr)
+    return 2
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = _build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except OSError as exc:
+        return _error(str(exc))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Streams of ex1/data_stream.py: text and bytes-like input parity, and the
+AdaptiveBatcher in front of StreamProcessor.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, List, Tuple
+
+import pytest
+
+from ex1.data_stream import (
+    AdaptiveBatcher,
+    DataStream,
+    EventStream,
+    SensorStream,
+    StreamProcessor,
+    TransactionStream,
+    split_records,
+)
+from ex1.stream_sketches import CountMinSketch, HyperLogLog, KLLSketch
+
+
+TEXT = ["temp:21.5", "  temp:21.5  ", "humidity:60\r", " temp : 3 "]
+
+AS_INPUT: List[Callable[[str], Any]] = [
+    str,
+    str.encode,
+    lambda text: bytearray(text.encode()),
+    lambda text: memoryview(b"#" + text.encode() + b"#")[1:-1],
+]
+
+
+@pytest.mark.parametrize("convert", AS_INPUT)
+def test_input_types_give_same_analysis_and_sketches(
+    convert: Callable[[str], Any],
+) -> None:
+    stream = SensorStream("S")
+    stream.attach_sketch("distinct", HyperLogLog())
+    stream.attach_sketch("heavy", CountMinSketch())
+
+    result = stream.process_batch([convert(text) for text in TEXT])
+
+    assert result == "Sensor analysis: 4 readings processed, avg temp: 21.5°C"
+    assert stream.get_sketch("distinct").count() == 3
+    assert stream.get_sketch("heavy").heavy_hitters()[0] == ("temp:21.5", 2)
+
+
+@pytest.mark.parametrize("convert", AS_INPUT)
+def test_transactions_and_events_accept_bytes(
+    convert: Callable[[str], Any],
+) -> None:
+    trans = TransactionStream("T")
+    ops = [convert(op) for op in ("buy:100", " sell:150 ", "buy : 75", "x")]
+    assert trans.process_batch(ops) == (
+        "Transaction analysis: 4 operations, net flow: -25 units"
+    )
+    assert len(trans.filter_data(ops, "large")) == 2
+
+    events = [convert(e) for e in ("login", " ERROR ", "logout")]
+    assert EventStream("E").process_batch(events) == (
+        "Event analysis: 3 events, 1 error detected"
+    )
+
+
+def test_split_records_strips_without_copying() -> None:
+    buffer = bytearray(b"temp:1\r\n  temp:1  \n\n \t \nhumidity:5")
+    records = split_records(buffer)
+
+    assert [bytes(r) for r in records] == [b"temp:1", b"temp:1", b"humidity:5"]
+    assert all(r.obj is buffer for r in records)
+    assert split_records(b"") == []
+
+
+
+def test_failing_sketch_never_changes_the_batch_result() -> None:
+    stream = SensorStream("S")
+    stream.attach_sketch("raw", KLLSketch())  # no extractor: rejects text
+    stream.attach_sketch("distinct", HyperLogLog())
+    stream.attach_sketch("partial", HyperLogLog(), lambda r: 1 / len(r))
+
+    result = stream.process_batch(["temp:1", "", "temp:2"])
+
+    assert result == "Sensor analysis: 3 readings processed, avg temp: 1.5°C"
+    assert stream.get_sketch("raw").n == 0
+    assert stream.get_sketch("distinct").count() == 3
+    assert stream.get_sketch("partial").count() == 1
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TimedStream(DataStream):
+    """Stub stream whose batches take a scripted time on FakeClock."""
+
+    def __init__(self, clock: FakeClock, latency: float) -> None:
+        super().__init__("TIMED", "Stub")
+        self.clock = clock
+        self.latency = latency
+        self.batches: List[int] = []
+
+    def process_batch(self, data_batch: List[Any]) -> str:
+        self.clock.now += self.latency
+        self.batches.append(len(data_batch))
+        return f"batch of {len(data_batch)}"
+
+
+def _batcher(
+    latency: float,
+    **options: Any,
+) -> Tuple[AdaptiveBatcher, TimedStream, FakeClock]:
+    clock = FakeClock()
+    stream = TimedStream(clock, latency)
+    processor = StreamProcessor()
+    processor.register(stream)
+    settings = {
+        "target_latency": 0.010,
+        "max_delay": 1.0,
+        "initial_size": 4,
+        "min_size": 2,
+        "max_size": 12,
+        "increase": 3,
+        "decrease": 0.5,
+    }
+    settings.update(options)
+    return AdaptiveBatcher(processor, clock=clock, **settings), stream, clock
+
+
+def test_size_triggered_flush_at_target_size() -> None:
+    batcher, stream, _ = _batcher(latency=0.001)
+
+    assert [batcher.submit("TIMED", i) for i in range(3)] == [None] * 3
+    assert batcher.submit("TIMED", 3) == "batch of 4"
+    assert stream.batches == [4]
+
+
+def test_poll_flushes_after_max_delay() -> None:
+    batcher, stream, clock = _batcher(latency=0.001)
+    batcher.submit("TIMED", "a")
+    batcher.submit("TIMED", "b")
+
+    clock.now = 0.999
+    assert batcher.poll() == {}
+    clock.now = 1.0
+    assert batcher.poll() == {"TIMED": "batch of 2"}
+    assert batcher.poll() == {}
+    assert stream.batches == [2]
+
+
+def test_full_batches_under_target_grow_additively() -> None:
+    batcher, stream, _ = _batcher(latency=0.001)
+
+    for i in range(4 + 7 + 10 + 12 + 12):
+        batcher.submit("TIMED", i)
+
+    assert stream.batches == [4, 7, 10, 12, 12]
+    assert batcher.target_size("TIMED") == 12  # clamped to max_size
+
+
+def test_overshoot_shrinks_multiplicatively() -> None:
+    batcher, stream, _ = _batcher(latency=0.050, initial_size=12)
+
+    for i in range(12 + 6 + 3 + 2):
+        batcher.submit("TIMED", i)
+
+    assert stream.batches == [12, 6, 3, 2]
+    assert batcher.target_size("TIMED") == 2  # clamped to min_size
+
+
+def test_deadline_flush_of_partial_batch_keeps_target() -> None:
+    batcher, stream, clock = _batcher(latency=0.001)
+    batcher.submit("TIMED", "a")
+
+    clock.now = 2.0
+    batcher.poll()
+    assert stream.batches == [1]
+    assert batcher.target_size("TIMED") == 4
+
+    batcher.submit("TIMED", "b")
+    clock.now = 4.0
+    assert batcher.submit("TIMED", "c") == "batch of 2"
+    assert batcher.target_size("TIMED") == 4
+
+
+def test_unknown_stream_is_rejected() -> None:
+    batcher, _, _ = _batcher(latency=0.001)
+    with pytest.raises(ValueError):
+        batcher.submit("MISSING", 1)
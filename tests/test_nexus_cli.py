@@ -0,0 +1,114 @@
+"""
+The code-nexus command line of nexus_cli.py.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+from pathlib import Path
+from typing import List
+
+import pytest
+
+import nexus_cli
+
+_BENCH = Path(__file__).resolve().parent.parent / "bench"
+_spec = importlib.util.spec_from_file_location(
+    "startup_importtime", _BENCH / "startup_importtime.py"
+)
+assert _spec is not None and _spec.loader is not None
+startup_importtime = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(startup_importtime)
+
+
+def _write(tmp_path: Path, lines: List[str]) -> str:
+    path = tmp_path / "input.txt"
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+def test_sensor_quantiles_read_only_temperatures(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    data = _write(
+        tmp_path,
+        ["temp:21", "humidity:60", "ALERT:temp:80", "pressure:1013",
+         "temp:23"],
+    )
+
+    assert nexus_cli.main(["stream", data, "--sketch", "quantiles"]) == 0
+
+    assert "Sketch quantiles: p50=21, p90=23, p99=23" in capsys.readouterr().out
+
+
+def test_transaction_heavy_hitters_count_amounts(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    data = _write(tmp_path, ["buy:100", "sell:150", "buy:100", "buy : 75"])
+
+    status = nexus_cli.main(
+        ["stream", data, "--type", "transaction", "--sketch", "heavy"]
+    )
+
+    assert status == 0
+    assert "Sketch heavy: 100 (2), 150 (1), 75 (1)" in capsys.readouterr().out
+
+
+def test_quantiles_without_values_is_a_usage_error(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    data = _write(tmp_path, ["login", "logout"])
+
+    status = nexus_cli.main(
+        ["stream", data, "--type", "event", "--sketch", "quantiles"]
+    )
+
+    assert status == 2
+    assert capsys.readouterr().err == (
+        "code-nexus: event records have no quantiles value\n"
+    )
+
+
+def test_unreadable_file_is_reported_with_exit_2(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    missing = str(tmp_path / "missing.txt")
+
+    assert nexus_cli.main(["pipeline", missing]) == 2
+    assert capsys.readouterr().err.startswith("code-nexus: [Errno 2]")
+
+
+@pytest.mark.parametrize("size", ["0", "-3", "ten"])
+def test_batch_size_must_be_a_positive_integer(
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    size: str,
+) -> None:
+    data = _write(tmp_path, ["temp:21"])
+
+    with pytest.raises(SystemExit) as exit_info:
+        nexus_cli.main(["stream", data, "--batch-size", size])
+
+    assert exit_info.value.code == 2
+    assert "must be a positive integer" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("command", sorted(startup_importtime.BARE_PATHS))
+def test_bare_paths_keep_optional_backends_lazy(
+    tmp_path: Path,
+    command: str,
+) -> None:
+    # Only the module list is checked here; the millisecond budget is
+    # machine dependent and stays with bench/startup_importtime.py.
+    argv, sample, lazy = startup_importtime.BARE_PATHS[command]
+    data = tmp_path / "sample.txt"
+    data.write_text(sample)
+
+    _, modules = startup_importtime.measure(argv, str(data), runs=1)
+
+    assert "nexus_cli" in modules
+    assert [name for name in lazy if name in modules] == []
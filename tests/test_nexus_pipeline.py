@@ -0,0 +1,281 @@
+"""
+ProcessingPipeline.run_many() of ex2/nexus_pipeline.py.
+"""
+
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Any, Callable, List
+
+import pytest
+
+from ex2.nexus_pipeline import (
+    CSVAdapter,
+    ExecutionPolicy,
+    NexusManager,
+    OutputStage,
+    ProcessingPipeline,
+    TransformStage,
+)
+
+
+def _bounded(call: Callable[[], Any], timeout: float = 10.0) -> Any:
+    """Run call in a thread and fail (instead of hanging) on timeout."""
+    outcome: List[Any] = []
+
+    def target() -> None:
+        try:
+            outcome.append(("ok", call()))
+        except Exception as exc:
+            outcome.append(("error", exc))
+
+    thread = threading.Thread(target=target, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    assert outcome, "run_many did not terminate"
+    status, value = outcome[0]
+    if status == "error":
+        raise value
+    return value
+
+
+class Jitter:
+    """Passes items through after a small random delay."""
+
+    def __init__(self, seed: int) -> None:
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def process(self, data: Any) -> Any:
+        with self._lock:
+            delay = self._rng.uniform(0, 0.002)
+        time.sleep(delay)
+        return data
+
+
+class Recorder(OutputStage):
+    def __init__(self) -> None:
+        self.seen: List[Any] = []
+        self._lock = threading.Lock()
+
+    def process(self, data: Any) -> Any:
+        with self._lock:
+            self.seen.append(data)
+        return data
+
+
+class Sleep:
+    def __init__(self, seconds: float) -> None:
+        self.seconds = seconds
+
+    def process(self, data: Any) -> Any:
+        time.sleep(self.seconds)
+        return data
+
+
+class FailOn:
+    def __init__(self, bad: Any) -> None:
+        self.bad = bad
+
+    def process(self, data: Any) -> Any:
+        if data == self.bad:
+            raise ValueError(f"bad item {data}")
+        return data
+
+
+def _pipeline(*stages: Any) -> ProcessingPipeline:
+    pipeline = CSVAdapter("TEST")
+    pipeline.stages = list(stages)
+    return pipeline
+
+
+def test_keyed_thread_stages_keep_per_key_order() -> None:
+    recorder = Recorder()
+    pipeline = _pipeline(Jitter(1), Jitter(2), recorder)
+    pipeline.set_stage_policy(0, ExecutionPolicy.threads(4))
+    pipeline.set_stage_policy(1, ExecutionPolicy.threads(3))
+    pipeline.set_stage_policy(2, ExecutionPolicy.threads(2))
+    items = [(key, i) for i in range(30) for key in "abcdef"]
+
+    results = _bounded(lambda: pipeline.run_many(items, key=lambda d: d[0]))
+
+    assert results == items
+    for key in "abcdef":
+        assert [d for d in recorder.seen if d[0] == key] == [
+            d for d in items if d[0] == key
+        ]
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [ExecutionPolicy(), ExecutionPolicy.threads(3)],
+)
+def test_failing_item_yields_none_and_counts_error(
+    policy: ExecutionPolicy,
+) -> None:
+    pipeline = _pipeline(FailOn(3), OutputStage())
+    pipeline.set_stage_policy(0, policy)
+
+    results = _bounded(lambda: pipeline.run_many(range(6)))
+
+    assert results == [0, 1, 2, None, 4, 5]
+    stats = pipeline.get_stats()
+    assert stats["processed"] == 5
+    assert stats["errors"] == 1
+    assert stats["last_error"] == "ValueError: bad item 3"
+    assert pipeline.get_stage_stats()[0]["errors"] == 1
+
+
+@pytest.mark.parametrize("keyed", [False, True])
+def test_empty_input_terminates(keyed: bool) -> None:
+    pipeline = _pipeline(Sleep(0), OutputStage())
+    pipeline.set_stage_policy(0, ExecutionPolicy.threads(2))
+    key = (lambda d: d) if keyed else None
+
+    assert _bounded(lambda: pipeline.run_many([], key=key)) == []
+    assert _pipeline(OutputStage()).run_many([]) == []
+
+
+def test_key_error_does_not_hang() -> None:
+    pipeline = _pipeline(Sleep(0.001), OutputStage())
+    pipeline.set_stage_policy(0, ExecutionPolicy.threads(2, queue_size=1))
+
+    def key(data: int) -> int:
+        if data == 5:
+            raise KeyError(data)
+        return data
+
+    with pytest.raises(KeyError):
+        _bounded(lambda: pipeline.run_many(range(20), key=key))
+
+
+def test_bounded_queue_applies_backpressure() -> None:
+    produced: List[int] = []
+    lead: List[int] = []
+
+    class Producer:
+        def process(self, data: int) -> int:
+            produced.append(data)
+            return data
+
+    class Consumer:
+        def process(self, data: int) -> int:
+            lead.append(len(produced) - data)
+            time.sleep(0.002)
+            return data
+
+    pipeline = _pipeline(Producer(), Consumer())
+    pipeline.set_stage_policy(1, ExecutionPolicy.threads(1, queue_size=2))
+
+    _bounded(lambda: pipeline.run_many(range(40)))
+
+    # Queue of 2, plus the item the producer is blocked putting.
+    assert max(lead) <= 2 + 1
+
+
+def test_stage_stats_point_at_the_bottleneck() -> None:
+    pipeline = _pipeline(OutputStage(), Sleep(0.005), OutputStage())
+    pipeline.set_stage_policy(1, ExecutionPolicy.threads(2))
+
+    _bounded(lambda: pipeline.run_many(range(40)))
+
+    stats = pipeline.get_stage_stats()
+    assert [s["items"] for s in stats] == [40, 40, 40]
+    assert stats[1]["mode"] == "thread" and stats[1]["workers"] == 2
+    bottleneck = max(stats, key=lambda s: s["utilization"])
+    assert bottleneck["stage"] == "Sleep"
+    assert bottleneck["utilization"] > 0.5
+
+
+def test_process_stage_after_thread_stage_accepts_bytes_input() -> None:
+    pipeline = CSVAdapter("BYTES")
+    pipeline.set_stage_policy(0, ExecutionPolicy.threads(2))
+    pipeline.set_stage_policy(1, ExecutionPolicy.processes(2))
+    inputs = [b"alice,login", memoryview(b"#bob,logout#")[1:-1], "carol"]
+
+    results = _bounded(lambda: pipeline.run_many(inputs), timeout=60.0)
+
+    assert [r["payload"] for r in results] == [
+        b"alice,login",
+        b"bob,logout",
+        "carol",
+    ]
+    assert pipeline.get_stats()["errors"] == 0
+
+
+def test_bytearray_input_is_not_pinned_by_results() -> None:
+    buffer = bytearray(b"alice,login")
+    results = CSVAdapter("REUSE").run_many([buffer])
+
+    assert results[0]["payload"] is buffer
+    buffer.extend(b",more")  # a reused recv_into buffer must stay resizable
+
+
+def test_failing_sketch_is_not_a_pipeline_error() -> None:
+    from ex1.stream_sketches import HyperLogLog, KLLSketch
+
+    pipeline = CSVAdapter("SKETCH")
+    pipeline.attach_sketch("raw", KLLSketch())
+    pipeline.attach_sketch("distinct", HyperLogLog())
+
+    assert pipeline.process("alice,login") == (
+        "User activity logged: 1 actions processed"
+    )
+    assert pipeline.run_many(["bob,logout"])[0]["payload"] == "bob,logout"
+    assert pipeline.get_stats()["processed"] == 2
+    assert pipeline.get_stats()["errors"] == 0
+    assert pipeline.get_sketch("distinct").count() == 2
+
+
+def test_stage_policy_survives_stage_replacement() -> None:
+    pipeline = CSVAdapter("POLICY")
+    threads = ExecutionPolicy.threads(2)
+    pipeline.set_stage_policy(-2, threads)
+
+    pipeline.set_transform_stage(TransformStage())
+    assert pipeline.get_stage_policy(1) is threads
+    NexusManager().recover_pipeline(pipeline)
+    assert pipeline.get_stage_policy(1) is threads
+
+    assert not hasattr(pipeline.stages[1], "policy")
+    with pytest.raises(IndexError):
+        pipeline.set_stage_policy(3, threads)
+
+
+def test_unrelated_policy_attribute_is_not_an_execution_policy() -> None:
+    class Retrying(OutputStage):
+        policy = "retry-3x"
+
+    declared = Retrying()
+    declared_policy = OutputStage()
+    declared_policy.policy = ExecutionPolicy.threads(2)  # type: ignore
+    pipeline = _pipeline(declared, declared_policy)
+
+    assert pipeline.get_stage_policy(0).mode == ExecutionPolicy.INLINE
+    assert pipeline.get_stage_policy(1).workers == 2
+    assert _bounded(lambda: pipeline.run_many([1, 2])) == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "policy",
+    [ExecutionPolicy(), ExecutionPolicy.threads(2)],
+)
+def test_failure_while_finishing_counts_as_error_on_both_paths(
+    policy: ExecutionPolicy,
+) -> None:
+    pipeline = _pipeline(OutputStage())
+    pipeline.set_stage_policy(0, policy)
+
+    def observe(data: Any) -> None:
+        if data == 1:
+            raise RuntimeError("observer broke")
+
+    pipeline._observe = observe  # type: ignore[method-assign]
+
+    results = _bounded(lambda: pipeline.run_many(range(3)))
+
+    assert results == [0, None, 2]
+    assert pipeline.get_stats()["processed"] == 2
+    assert pipeline.get_stats()["errors"] == 1
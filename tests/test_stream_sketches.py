@@ -0,0 +1,153 @@
+"""
+Error bounds and serialization of ex1/stream_sketches.py.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import random
+import statistics
+from collections import Counter
+from typing import Any, List
+
+import pytest
+
+from ex1.stream_sketches import (
+    CountMinSketch,
+    HyperLogLog,
+    KLLSketch,
+    sketch_from_dict,
+)
+
+
+def _roundtrip(sketch: Any) -> Any:
+    return sketch_from_dict(json.loads(json.dumps(sketch.to_dict())))
+
+
+@pytest.mark.parametrize(
+    "precision, cardinality",
+    [
+        (10, 50),
+        (10, 500),
+        (10, 2000),
+        (10, 2560),  # classic estimator's linear-counting switch (2.5 * m)
+        (10, 5000),
+        (10, 20000),
+        (12, 10000),  # same region for the default precision
+    ],
+)
+def test_hll_relative_error(precision: int, cardinality: int) -> None:
+    errors: List[float] = []
+    for seed in range(12):
+        sketch = HyperLogLog(precision)
+        for i in range(cardinality):
+            sketch.add(f"{seed}-user-{i}")
+        errors.append(sketch.count() / cardinality - 1)
+
+    bound = HyperLogLog(precision).relative_error
+    assert abs(statistics.mean(errors)) < bound
+    assert statistics.pstdev(errors) < 1.5 * bound
+    assert max(abs(e) for e in errors) < 4 * bound
+
+
+def test_hll_counts_duplicates_once() -> None:
+    sketch = HyperLogLog()
+    for _ in range(5):
+        for i in range(100):
+            sketch.add(f"user-{i}")
+    assert sketch.count() == pytest.approx(100, abs=3)
+    assert HyperLogLog().count() == 0
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_kll_rank_error(seed: int) -> None:
+    rng = random.Random(seed)
+    values = [rng.gauss(20.0, 5.0) for _ in range(50000)]
+    sketch = KLLSketch(seed=seed)
+    for value in values:
+        sketch.add(value)
+
+    exact = sorted(values)
+    for q in (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99):
+        rank = bisect.bisect_right(exact, sketch.quantile(q)) / len(exact)
+        assert abs(rank - q) <= 0.0165
+
+
+def test_cms_never_undercounts_and_respects_epsilon() -> None:
+    rng = random.Random(7)
+    sketch = CountMinSketch.from_error(epsilon=0.005, delta=0.01)
+    truth: Counter = Counter()
+    for _ in range(20000):
+        item = f"amount:{int(rng.paretovariate(1.2))}"
+        sketch.add(item)
+        truth[item] += 1
+
+    slack = sketch.epsilon * sketch.n
+    over_bound = 0
+    for item, count in truth.items():
+        estimate = sketch.estimate(item)
+        assert estimate >= count
+        over_bound += estimate - count > slack
+    assert over_bound <= max(1, sketch.delta * len(truth))
+
+    top_item, top_count = truth.most_common(1)[0]
+    assert sketch.heavy_hitters(0.1)[0][0] == top_item
+    assert sketch.heavy_hitters(0.1)[0][1] >= top_count
+
+
+def test_roundtrip_and_merge_across_workers() -> None:
+    rng = random.Random(11)
+    items = [f"user-{int(rng.paretovariate(1.0))}" for _ in range(8000)]
+    values = [rng.uniform(0, 100) for _ in range(8000)]
+
+    whole_hll, whole_cms = HyperLogLog(), CountMinSketch()
+    for item in items:
+        whole_hll.add(item)
+        whole_cms.add(item)
+
+    shipped: List[List[str]] = []
+    for worker in range(4):
+        hll, cms = HyperLogLog(), CountMinSketch()
+        kll = KLLSketch(seed=worker)
+        for item, value in zip(items[worker::4], values[worker::4]):
+            hll.add(item)
+            cms.add(item)
+            kll.add(value)
+        shipped.append([
+            json.dumps(sketch.to_dict()) for sketch in (hll, cms, kll)
+        ])
+
+    merged = [sketch_from_dict(json.loads(data)) for data in shipped[0]]
+    for payloads in shipped[1:]:
+        for target, data in zip(merged, payloads):
+            target.merge(sketch_from_dict(json.loads(data)))
+    hll, cms, kll = (_roundtrip(sketch) for sketch in merged)
+
+    assert hll.to_dict() == whole_hll.to_dict()
+    assert hll.count() == whole_hll.count()
+
+    assert cms.n == whole_cms.n == len(items)
+    for item in set(items):
+        assert cms.estimate(item) == whole_cms.estimate(item)
+    top_item = Counter(items).most_common(1)[0][0]
+    assert cms.heavy_hitters(0.02)[0][0] == top_item
+
+    assert kll.n == len(values)
+    exact = sorted(values)
+    for q in (0.1, 0.5, 0.9):
+        rank = bisect.bisect_right(exact, kll.quantile(q)) / len(exact)
+        assert abs(rank - q) <= 0.0165
+
+
+def test_merge_and_restore_reject_mismatches() -> None:
+    with pytest.raises(ValueError):
+        HyperLogLog(10).merge(HyperLogLog(12))
+    with pytest.raises(ValueError):
+        CountMinSketch(width=64).merge(CountMinSketch(width=128))
+    with pytest.raises(ValueError):
+        KLLSketch(k=100).merge(KLLSketch(k=200))
+    with pytest.raises(ValueError):
+        KLLSketch().merge(HyperLogLog())
+    with pytest.raises(ValueError):
+        sketch_from_dict({"kind": "bloom"})